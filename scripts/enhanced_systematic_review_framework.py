@@ -7,16 +7,29 @@ a comprehensive knowledge base for systematic review and future research.
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.font_manager import FontProperties
 import seaborn as sns
 from scipy import stats
 from scipy.stats import chi2_contingency
 import json
 import re
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_INT_RE = re.compile(r'\d+')
+_NUM_RE = re.compile(r'\d+(?:\.\d+)?')
+
 class BiomarkerMetaAnalysis:
     """Class for performing meta-analysis on biomarker data"""
     
@@ -38,13 +51,22 @@ class BiomarkerMetaAnalysis:
             'mitochondrial_biomarkers_cohorts.csv'
         ]
         
-        for file in csv_files:
+        def _read(path):
             try:
-                df = pd.read_csv(f'/home/ubuntu/upload/{file}')
-                data_sources[file.replace('.csv', '')] = df
-                print(f"Loaded {file}: {len(df)} rows")
+                return path, self.read_cached_csv(path, cache_dir), None
             except Exception as e:
-                print(f"Could not load {file}: {e}")
+                return path, None, e
+        
+        # Parse files concurrently; pandas releases the GIL while parsing
+        upload_dir = Path('/home/ubuntu/upload')
+        cache_dir = Path('/tmp/cache')
+        with ThreadPoolExecutor(max_workers=min(8, len(csv_files))) as ex:
+            for path, df, error in ex.map(_read, [upload_dir / f for f in csv_files]):
+                if error is None:
+                    data_sources[path.stem] = df
+                    print(f"Loaded {path.name}: {len(df)} rows")
+                else:
+                    print(f"Could not load {path.name}: {error}")
         
         # Load our original analysis
         try:
@@ -53,186 +75,259 @@ class BiomarkerMetaAnalysis:
             print(f"Loaded original analysis: {len(original_data)} rows")
         except Exception as e:
             print(f"Could not load original analysis: {e}")
-            
-        return data_sources
+        
+        # Normalize text columns once; the parsing helpers still str() numeric-typed columns
+        return {name: self.fill_text_columns(df) for name, df in data_sources.items()}
+    
+    def column_arrays(self, df, defaults):
+        """Extract the needed columns as arrays, filling absent columns with defaults"""
+        return {
+            col: df[col].to_numpy() if col in df.columns else np.full(len(df), default, dtype=object)
+            for col, default in defaults.items()
+        }
+    
+    def fill_text_columns(self, df):
+        """Replace missing values in text columns with empty strings"""
+        text_cols = df.select_dtypes(include=['object', 'string']).columns
+        df[text_cols] = df[text_cols].fillna('').astype(str)
+        return df
+    
+    def read_cached_csv(self, csv_path, cache_dir):
+        """Read a CSV, reusing a Parquet copy when it is newer than the source"""
+        cache_path = cache_dir / f'{csv_path.stem}.parquet'
+        if cache_path.exists() and cache_path.stat().st_mtime > csv_path.stat().st_mtime:
+            try:
+                return pd.read_parquet(cache_path, engine='pyarrow')
+            except Exception as e:
+                print(f"Ignoring unreadable cache {cache_path}: {e}")
+        
+        df = pd.read_csv(csv_path)
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(cache_path, engine='pyarrow', compression='zstd', index=False)
+        except Exception as e:
+            # Caching is optional (requires pyarrow); the parsed CSV is still usable
+            print(f"Could not cache {csv_path.name}: {e}")
+        return df
     
     def create_master_study_database(self, data_sources):
         """Create comprehensive study database with unique study IDs"""
-        studies = []
-        study_id = 1
+        studies = defaultdict(list)
         
         # Process systematic review cohorts
         if 'systematic_review_cohorts' in data_sources:
             df = data_sources['systematic_review_cohorts']
-            for _, row in df.iterrows():
-                study = {
-                    'study_id': f'S{study_id:03d}',
-                    'first_author': row.get('Study_First_Author', 'Unknown'),
-                    'year': self.extract_year(row.get('Study_First_Author', '')),
-                    'primary_biomarker': row.get('Primary_Biomarker', ''),
-                    'total_cohort_size': self.parse_cohort_size(row.get('Total_Cohort_Size', '')),
-                    'age_range': row.get('Age_Range', ''),
-                    'conditions': row.get('Specific_Conditions', ''),
-                    'location': row.get('Geographic_Location', ''),
-                    'key_findings': row.get('Key_Findings', ''),
-                    'data_source': 'systematic_review_cohorts'
-                }
-                studies.append(study)
-                study_id += 1
+            cols = self.column_arrays(df, {
+                'Study_First_Author': 'Unknown',
+                'Primary_Biomarker': '',
+                'Total_Cohort_Size': '',
+                'Age_Range': '',
+                'Specific_Conditions': '',
+                'Geographic_Location': '',
+                'Key_Findings': ''
+            })
+            studies['first_author'].extend(cols['Study_First_Author'])
+            studies['year'].extend(self.extract_year(a) for a in cols['Study_First_Author'])
+            studies['primary_biomarker'].extend(cols['Primary_Biomarker'])
+            studies['total_cohort_size'].extend(self.parse_cohort_size(s) for s in cols['Total_Cohort_Size'])
+            studies['age_range'].extend(cols['Age_Range'])
+            studies['conditions'].extend(cols['Specific_Conditions'])
+            studies['location'].extend(cols['Geographic_Location'])
+            studies['key_findings'].extend(cols['Key_Findings'])
+            studies['data_source'].extend(['systematic_review_cohorts'] * len(df))
         
         # Add studies from other sources
         # Process original analysis data
         if 'original_analysis' in data_sources:
             df = data_sources['original_analysis']
             conditions = df['Condition'].unique()
-            for condition in conditions:
-                study = {
-                    'study_id': f'S{study_id:03d}',
-                    'first_author': 'Multiple Studies',
-                    'year': '2024',
-                    'primary_biomarker': 'Multiple',
-                    'total_cohort_size': len(df[df['Condition'] == condition]),
-                    'age_range': 'Mixed',
-                    'conditions': condition,
-                    'location': 'Multiple',
-                    'key_findings': f'Analysis of {condition} biomarkers',
-                    'data_source': 'original_analysis'
-                }
-                studies.append(study)
-                study_id += 1
+            n = len(conditions)
+            studies['first_author'].extend(['Multiple Studies'] * n)
+            studies['year'].extend(['2024'] * n)
+            studies['primary_biomarker'].extend(['Multiple'] * n)
+            studies['total_cohort_size'].extend(int((df['Condition'] == c).sum()) for c in conditions)
+            studies['age_range'].extend(['Mixed'] * n)
+            studies['conditions'].extend(conditions)
+            studies['location'].extend(['Multiple'] * n)
+            studies['key_findings'].extend(f'Analysis of {c} biomarkers' for c in conditions)
+            studies['data_source'].extend(['original_analysis'] * n)
         
-        return pd.DataFrame(studies)
+        studies_df = pd.DataFrame(studies)
+        studies_df.insert(0, 'study_id', [f'S{i:03d}' for i in range(1, len(studies_df) + 1)])
+        return studies_df
     
     def create_master_biomarker_database(self, data_sources):
         """Create comprehensive biomarker database"""
-        biomarkers = []
-        biomarker_id = 1
+        review_biomarkers = []
+        performance_biomarkers = []
+        original_biomarkers = []
         
         # Process systematic review biomarkers
         if 'systematic_review_biomarkers' in data_sources:
             df = data_sources['systematic_review_biomarkers']
-            for _, row in df.iterrows():
-                biomarker = {
-                    'biomarker_id': f'B{biomarker_id:03d}',
-                    'biomarker_name': row.get('Biomarker', ''),
-                    'molecular_class': row.get('Molecular_Class', ''),
-                    'biomaterial': row.get('Biomaterial', ''),
-                    'analytical_method': row.get('Analytical_Method', ''),
-                    'sensitivity_percent': self.parse_performance_metric(row.get('Sensitivity_%', '')),
-                    'specificity_percent': self.parse_performance_metric(row.get('Specificity_%', '')),
-                    'disease_specificity': row.get('Disease_Specificity', ''),
-                    'age_group_performance': row.get('Age_Group_Performance', ''),
+            cols = self.column_arrays(df, {
+                'Biomarker': '',
+                'Molecular_Class': '',
+                'Biomaterial': '',
+                'Analytical_Method': '',
+                'Sensitivity_%': '',
+                'Specificity_%': '',
+                'Disease_Specificity': '',
+                'Age_Group_Performance': ''
+            })
+            review_biomarkers = [
+                {
+                    'biomarker_name': cols['Biomarker'][i],
+                    'molecular_class': cols['Molecular_Class'][i],
+                    'biomaterial': cols['Biomaterial'][i],
+                    'analytical_method': cols['Analytical_Method'][i],
+                    'sensitivity_percent': self.parse_performance_metric(cols['Sensitivity_%'][i]),
+                    'specificity_percent': self.parse_performance_metric(cols['Specificity_%'][i]),
+                    'disease_specificity': cols['Disease_Specificity'][i],
+                    'age_group_performance': cols['Age_Group_Performance'][i],
                     'data_source': 'systematic_review_biomarkers'
                 }
-                biomarkers.append(biomarker)
-                biomarker_id += 1
+                for i in range(len(df))
+            ]
         
         # Process performance data
         if 'mitochondrial_biomarkers_performance' in data_sources:
             df = data_sources['mitochondrial_biomarkers_performance']
-            for _, row in df.iterrows():
-                biomarker = {
-                    'biomarker_id': f'B{biomarker_id:03d}',
-                    'biomarker_name': row.get('Biomarker', ''),
-                    'molecular_class': row.get('Molecular_Origin', ''),
-                    'biomaterial': row.get('Biomaterial', ''),
-                    'analytical_method': row.get('Analytical_Method', ''),
-                    'sensitivity_percent': self.parse_performance_metric(row.get('Sensitivity_%', '')),
-                    'specificity_percent': self.parse_performance_metric(row.get('Specificity_%', '')),
-                    'clinical_application': row.get('Clinical_Application', ''),
+            cols = self.column_arrays(df, {
+                'Biomarker': '',
+                'Molecular_Origin': '',
+                'Biomaterial': '',
+                'Analytical_Method': '',
+                'Sensitivity_%': '',
+                'Specificity_%': '',
+                'Clinical_Application': ''
+            })
+            performance_biomarkers = [
+                {
+                    'biomarker_name': cols['Biomarker'][i],
+                    'molecular_class': cols['Molecular_Origin'][i],
+                    'biomaterial': cols['Biomaterial'][i],
+                    'analytical_method': cols['Analytical_Method'][i],
+                    'sensitivity_percent': self.parse_performance_metric(cols['Sensitivity_%'][i]),
+                    'specificity_percent': self.parse_performance_metric(cols['Specificity_%'][i]),
+                    'clinical_application': cols['Clinical_Application'][i],
                     'data_source': 'mitochondrial_biomarkers_performance'
                 }
-                biomarkers.append(biomarker)
-                biomarker_id += 1
+                for i in range(len(df))
+            ]
         
         # Process original analysis
         if 'original_analysis' in data_sources:
             df = data_sources['original_analysis']
-            for _, row in df.iterrows():
-                biomarker = {
-                    'biomarker_id': f'B{biomarker_id:03d}',
-                    'biomarker_name': row.get('Biomarker', ''),
-                    'molecular_class': row.get('Molecular_Type', ''),
-                    'biomaterial': row.get('Biomaterial', ''),
-                    'analytical_method': row.get('Analytical_Methods', ''),
-                    'sensitivity_range': row.get('Sensitivity_Range', ''),
-                    'specificity_range': row.get('Specificity_Range', ''),
-                    'auc_range': row.get('AUC_Range', ''),
-                    'condition': row.get('Condition', ''),
-                    'clinical_application': row.get('Clinical_Application', ''),
+            cols = self.column_arrays(df, {
+                'Biomarker': '',
+                'Molecular_Type': '',
+                'Biomaterial': '',
+                'Analytical_Methods': '',
+                'Sensitivity_Range': '',
+                'Specificity_Range': '',
+                'AUC_Range': '',
+                'Condition': '',
+                'Clinical_Application': ''
+            })
+            original_biomarkers = [
+                {
+                    'biomarker_name': cols['Biomarker'][i],
+                    'molecular_class': cols['Molecular_Type'][i],
+                    'biomaterial': cols['Biomaterial'][i],
+                    'analytical_method': cols['Analytical_Methods'][i],
+                    'sensitivity_range': cols['Sensitivity_Range'][i],
+                    'specificity_range': cols['Specificity_Range'][i],
+                    'auc_range': cols['AUC_Range'][i],
+                    'condition': cols['Condition'][i],
+                    'clinical_application': cols['Clinical_Application'][i],
                     'data_source': 'original_analysis'
                 }
-                biomarkers.append(biomarker)
-                biomarker_id += 1
+                for i in range(len(df))
+            ]
         
-        return pd.DataFrame(biomarkers)
+        biomarkers_df = pd.DataFrame(review_biomarkers + performance_biomarkers + original_biomarkers)
+        biomarkers_df.insert(0, 'biomarker_id', [f'B{i:03d}' for i in range(1, len(biomarkers_df) + 1)])
+        return biomarkers_df
     
     def create_detailed_performance_table(self, data_sources):
         """Create detailed performance table for meta-analysis"""
-        performance_data = []
-        entry_id = 1
+        performance_data = defaultdict(list)
         
         # Extract detailed performance metrics from all sources
         for source_name, df in data_sources.items():
             if source_name == 'systematic_review_biomarkers':
-                for _, row in df.iterrows():
-                    entry = {
-                        'entry_id': f'E{entry_id:03d}',
-                        'study_reference': 'Multiple studies',
-                        'biomarker_name': row.get('Biomarker', ''),
-                        'condition': row.get('Disease_Specificity', ''),
-                        'biomaterial': row.get('Biomaterial', ''),
-                        'analytical_method': row.get('Analytical_Method', ''),
-                        'sensitivity': self.parse_performance_metric(row.get('Sensitivity_%', '')),
-                        'specificity': self.parse_performance_metric(row.get('Specificity_%', '')),
-                        'n_patients': None,
-                        'n_controls': None,
-                        'age_group': row.get('Age_Group_Performance', ''),
-                        'molecular_type': row.get('Molecular_Class', ''),
-                        'data_source': source_name
-                    }
-                    performance_data.append(entry)
-                    entry_id += 1
-        
-        return pd.DataFrame(performance_data)
+                n = len(df)
+                cols = self.column_arrays(df, {
+                    'Biomarker': '',
+                    'Disease_Specificity': '',
+                    'Biomaterial': '',
+                    'Analytical_Method': '',
+                    'Sensitivity_%': '',
+                    'Specificity_%': '',
+                    'Age_Group_Performance': '',
+                    'Molecular_Class': ''
+                })
+                performance_data['study_reference'].extend(['Multiple studies'] * n)
+                performance_data['biomarker_name'].extend(cols['Biomarker'])
+                performance_data['condition'].extend(cols['Disease_Specificity'])
+                performance_data['biomaterial'].extend(cols['Biomaterial'])
+                performance_data['analytical_method'].extend(cols['Analytical_Method'])
+                performance_data['sensitivity'].extend(self.parse_performance_metric(s) for s in cols['Sensitivity_%'])
+                performance_data['specificity'].extend(self.parse_performance_metric(s) for s in cols['Specificity_%'])
+                performance_data['n_patients'].extend([None] * n)
+                performance_data['n_controls'].extend([None] * n)
+                performance_data['age_group'].extend(cols['Age_Group_Performance'])
+                performance_data['molecular_type'].extend(cols['Molecular_Class'])
+                performance_data['data_source'].extend([source_name] * n)
+        
+        performance_df = pd.DataFrame(performance_data)
+        performance_df.insert(0, 'entry_id', [f'E{i:03d}' for i in range(1, len(performance_df) + 1)])
+        return performance_df
     
     def perform_meta_analysis_by_biomarker(self, performance_df):
         """Perform meta-analysis for each biomarker"""
         meta_results = {}
         
-        biomarkers = performance_df['biomarker_name'].unique()
+        # Drop rows without a biomarker name before grouping
+        df = performance_df.dropna(subset=['biomarker_name'])
+        df = df[df['biomarker_name'] != '']
+        g = df.groupby('biomarker_name', sort=False)
         
-        for biomarker in biomarkers:
-            if pd.isna(biomarker) or biomarker == '':
-                continue
-                
-            biomarker_data = performance_df[performance_df['biomarker_name'] == biomarker]
-            
+        # Distinct descriptive values per biomarker (in order of appearance) in one grouped pass
+        conditions = g['condition'].unique()
+        biomaterials = g['biomaterial'].unique()
+        analytical_methods = g['analytical_method'].unique()
+        
+        for biomarker, biomarker_data in g:
             # Extract sensitivity and specificity data
-            sens_data = []
-            spec_data = []
+            sens_chunks = []
+            spec_chunks = []
             
             for _, row in biomarker_data.iterrows():
                 if pd.notna(row['sensitivity']):
                     sens_values = self.extract_numeric_values(str(row['sensitivity']))
-                    sens_data.extend(sens_values)
+                    sens_chunks.append(np.asarray(sens_values, dtype=np.float64))
                 
                 if pd.notna(row['specificity']):
                     spec_values = self.extract_numeric_values(str(row['specificity']))
-                    spec_data.extend(spec_values)
+                    spec_chunks.append(np.asarray(spec_values, dtype=np.float64))
+            
+            sens_arr = np.concatenate(sens_chunks) if sens_chunks else np.empty(0)
+            spec_arr = np.concatenate(spec_chunks) if spec_chunks else np.empty(0)
             
-            if sens_data or spec_data:
+            if sens_arr.size or spec_arr.size:
                 meta_results[biomarker] = {
                     'n_studies': len(biomarker_data),
-                    'sensitivity_mean': np.mean(sens_data) if sens_data else None,
-                    'sensitivity_std': np.std(sens_data) if len(sens_data) > 1 else None,
-                    'sensitivity_range': f"{min(sens_data)}-{max(sens_data)}" if sens_data else None,
-                    'specificity_mean': np.mean(spec_data) if spec_data else None,
-                    'specificity_std': np.std(spec_data) if len(spec_data) > 1 else None,
-                    'specificity_range': f"{min(spec_data)}-{max(spec_data)}" if spec_data else None,
-                    'conditions_studied': list(biomarker_data['condition'].unique()),
-                    'biomaterials': list(biomarker_data['biomaterial'].unique()),
-                    'analytical_methods': list(biomarker_data['analytical_method'].unique())
+                    'sensitivity_mean': sens_arr.mean() if sens_arr.size else None,
+                    'sensitivity_std': sens_arr.std() if sens_arr.size > 1 else None,
+                    'sensitivity_range': f"{sens_arr.min()}-{sens_arr.max()}" if sens_arr.size else None,
+                    'specificity_mean': spec_arr.mean() if spec_arr.size else None,
+                    'specificity_std': spec_arr.std() if spec_arr.size > 1 else None,
+                    'specificity_range': f"{spec_arr.min()}-{spec_arr.max()}" if spec_arr.size else None,
+                    'conditions_studied': list(conditions[biomarker]),
+                    'biomaterials': list(biomaterials[biomarker]),
+                    'analytical_methods': list(analytical_methods[biomarker])
                 }
         
         return meta_results
@@ -262,7 +357,8 @@ class BiomarkerMetaAnalysis:
         
         # Sensitivity forest plot
         y_pos = np.arange(len(biomarkers))
-        ax1.barh(y_pos, sensitivities, alpha=0.7, color='blue')
+        study_labels = [f'n={n}' for n in n_studies]
+        sens_bars = ax1.barh(y_pos, sensitivities, alpha=0.7, color='blue', rasterized=True)
         ax1.set_yticks(y_pos)
         ax1.set_yticklabels(biomarkers)
         ax1.set_xlabel('Sensitivity (%)')
@@ -270,11 +366,10 @@ class BiomarkerMetaAnalysis:
         ax1.set_xlim(0, 100)
         
         # Add study counts
-        for i, (sens, n) in enumerate(zip(sensitivities, n_studies)):
-            ax1.text(sens + 2, i, f'n={n}', va='center')
+        ax1.bar_label(sens_bars, labels=study_labels, padding=4)
         
         # Specificity forest plot
-        ax2.barh(y_pos, specificities, alpha=0.7, color='red')
+        spec_bars = ax2.barh(y_pos, specificities, alpha=0.7, color='red', rasterized=True)
         ax2.set_yticks(y_pos)
         ax2.set_yticklabels(biomarkers)
         ax2.set_xlabel('Specificity (%)')
@@ -282,12 +377,20 @@ class BiomarkerMetaAnalysis:
         ax2.set_xlim(0, 100)
         
         # Add study counts
-        for i, (spec, n) in enumerate(zip(specificities, n_studies)):
-            ax2.text(spec + 2, i, f'n={n}', va='center')
+        ax2.bar_label(spec_bars, labels=study_labels, padding=4)
         
-        plt.tight_layout()
-        plt.savefig(f'{output_dir}/biomarker_meta_analysis_forest_plot.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        # Size the margins from the longest label rather than running a tight_layout pass
+        fig_width = fig.get_figwidth()
+        renderer = fig.canvas.get_renderer()
+        tick_font = FontProperties(size=plt.rcParams['ytick.labelsize'])
+        label_width = max(renderer.get_text_width_height_descent(name, tick_font, ismath=False)[0]
+                          for name in biomarkers) / fig.dpi + 0.3
+        label_width = min(label_width, 0.35 * fig_width)
+        left, right, gap = label_width / fig_width, 0.95, label_width + 0.5  # gap also fits bar labels
+        axis_width = (fig_width * (right - left) - gap) / 2
+        fig.subplots_adjust(left=left, right=right, wspace=gap / axis_width)
+        fig.savefig(f'{output_dir}/biomarker_meta_analysis_forest_plot.png', dpi=150)
+        plt.close(fig)
         
         print(f"Forest plot saved to {output_dir}/biomarker_meta_analysis_forest_plot.png")
     
@@ -302,15 +405,34 @@ class BiomarkerMetaAnalysis:
                     'Biomarker': biomarker,
                     'N_Studies': results['n_studies'],
                     'Sensitivity_Mean': f"{results['sensitivity_mean']:.1f}" if results['sensitivity_mean'] else 'NR',
+                    'Sensitivity_Numeric': results['sensitivity_mean'],
                     'Sensitivity_Range': results['sensitivity_range'] if results['sensitivity_range'] else 'NR',
                     'Specificity_Mean': f"{results['specificity_mean']:.1f}" if results['specificity_mean'] else 'NR',
                     'Specificity_Range': results['specificity_range'] if results['specificity_range'] else 'NR',
-                    'Conditions_Studied': '; '.join([c for c in results['conditions_studied'] if pd.notna(c) and c != '']),
-                    'Biomaterials': '; '.join([b for b in results['biomaterials'] if pd.notna(b) and b != '']),
-                    'Analytical_Methods': '; '.join([m for m in results['analytical_methods'] if pd.notna(m) and m != ''])
+                    'Conditions_Studied': self.join_values(results['conditions_studied']),
+                    'Biomaterials': self.join_values(results['biomaterials']),
+                    'Analytical_Methods': self.join_values(results['analytical_methods'])
                 })
         
-        return pd.DataFrame(summary_data)
+        summary_df = pd.DataFrame(summary_data)
+        if not summary_df.empty:
+            # Nullable float keeps missing sensitivities as pd.NA for ranking
+            summary_df['Sensitivity_Numeric'] = summary_df['Sensitivity_Numeric'].astype('Float64')
+        return summary_df
+    
+    def save_intermediate_table(self, df, path_stem):
+        """Save an intermediate table as Parquet, falling back to CSV when that fails"""
+        parquet_path = Path(f'{path_stem}.parquet')
+        try:
+            df.to_parquet(parquet_path, engine='pyarrow', compression='zstd', index=False)
+            return parquet_path
+        except Exception as e:
+            # No pyarrow, or mixed-type object columns Arrow cannot convert
+            print(f"Could not write {parquet_path.name}, saving CSV instead: {e}")
+            parquet_path.unlink(missing_ok=True)
+            csv_path = Path(f'{path_stem}.csv')
+            df.to_csv(csv_path, index=False)
+            return csv_path
     
     # Helper methods
     def extract_year(self, author_string):
@@ -320,27 +442,23 @@ class BiomarkerMetaAnalysis:
     
     def parse_cohort_size(self, size_string):
         """Parse cohort size from string"""
-        if pd.isna(size_string):
-            return None
-        numbers = re.findall(r'\d+', str(size_string))
-        return int(numbers[0]) if numbers else None
+        match = _INT_RE.search(str(size_string))
+        return int(match.group()) if match else None
     
     def parse_performance_metric(self, metric_string):
         """Parse performance metric from string"""
-        if pd.isna(metric_string):
-            return None
         # Extract first number found
-        numbers = re.findall(r'\d+(?:\.\d+)?', str(metric_string))
-        return float(numbers[0]) if numbers else None
+        match = _NUM_RE.search(str(metric_string))
+        return float(match.group()) if match else None
+    
+    def join_values(self, values):
+        """Join the non-empty strings of a list of values"""
+        return '; '.join(v for v in values if isinstance(v, str) and v)
     
     def extract_numeric_values(self, text):
         """Extract all numeric values from text"""
-        if pd.isna(text) or text == '':
-            return []
-        
         # Find all numeric patterns including ranges
-        patterns = re.findall(r'(\d+(?:\.\d+)?)', str(text))
-        return [float(p) for p in patterns]
+        return [float(p) for p in _NUM_RE.findall(str(text))]
 
 def main():
     """Main function to run enhanced systematic review analysis"""
@@ -357,17 +475,17 @@ def main():
     # Create master databases
     print("\nCreating master study database...")
     studies_df = meta_analyzer.create_master_study_database(data_sources)
-    studies_df.to_csv('/home/ubuntu/master_study_database.csv', index=False)
+    studies_path = meta_analyzer.save_intermediate_table(studies_df, '/home/ubuntu/master_study_database')
     print(f"Created master study database with {len(studies_df)} studies")
     
     print("\nCreating master biomarker database...")
     biomarkers_df = meta_analyzer.create_master_biomarker_database(data_sources)
-    biomarkers_df.to_csv('/home/ubuntu/master_biomarker_database.csv', index=False)
+    biomarkers_path = meta_analyzer.save_intermediate_table(biomarkers_df, '/home/ubuntu/master_biomarker_database')
     print(f"Created master biomarker database with {len(biomarkers_df)} biomarkers")
     
     print("\nCreating detailed performance table...")
     performance_df = meta_analyzer.create_detailed_performance_table(data_sources)
-    performance_df.to_csv('/home/ubuntu/detailed_performance_table.csv', index=False)
+    performance_path = meta_analyzer.save_intermediate_table(performance_df, '/home/ubuntu/detailed_performance_table')
     print(f"Created detailed performance table with {len(performance_df)} entries")
     
     # Perform meta-analysis
@@ -375,8 +493,16 @@ def main():
     meta_results = meta_analyzer.perform_meta_analysis_by_biomarker(performance_df)
     
     # Save meta-analysis results
-    with open('/home/ubuntu/meta_analysis_results.json', 'w') as f:
-        json.dump(meta_results, f, indent=2, default=str)
+    results_path = Path('/home/ubuntu/meta_analysis_results.json')
+    if orjson is not None:
+        results_path.write_bytes(orjson.dumps(
+            meta_results,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ))
+    else:
+        with open(results_path, 'w') as f:
+            json.dump(meta_results, f, indent=2, default=str)
     print(f"Meta-analysis completed for {len(meta_results)} biomarkers")
     
     # Create forest plots
@@ -388,7 +514,9 @@ def main():
     summary_df = meta_analyzer.create_comprehensive_summary_table(
         studies_df, biomarkers_df, performance_df, meta_results
     )
-    summary_df.to_csv('/home/ubuntu/comprehensive_meta_analysis_summary.csv', index=False)
+    summary_df.drop(columns=['Sensitivity_Numeric'], errors='ignore').to_csv(
+        '/home/ubuntu/comprehensive_meta_analysis_summary.csv', index=False
+    )
     print(f"Created comprehensive summary with {len(summary_df)} biomarkers")
     
     # Print summary statistics
@@ -401,17 +529,16 @@ def main():
     # Top performing biomarkers
     if not summary_df.empty:
         print("\n=== TOP PERFORMING BIOMARKERS ===")
-        # Sort by sensitivity mean (convert to numeric first)
-        summary_df['Sensitivity_Numeric'] = pd.to_numeric(summary_df['Sensitivity_Mean'].replace('NR', np.nan), errors='coerce')
+        # Sort by the unformatted sensitivity mean
         top_biomarkers = summary_df.dropna(subset=['Sensitivity_Numeric']).nlargest(5, 'Sensitivity_Numeric')
         
         for _, row in top_biomarkers.iterrows():
             print(f"{row['Biomarker']}: Sensitivity {row['Sensitivity_Mean']}%, Specificity {row['Specificity_Mean']}% ({row['N_Studies']} studies)")
     
     print("\n=== FILES CREATED ===")
-    print("- master_study_database.csv")
-    print("- master_biomarker_database.csv") 
-    print("- detailed_performance_table.csv")
+    print(f"- {studies_path.name}")
+    print(f"- {biomarkers_path.name}")
+    print(f"- {performance_path.name}")
     print("- meta_analysis_results.json")
     print("- comprehensive_meta_analysis_summary.csv")
     print("- biomarker_meta_analysis_forest_plot.png")
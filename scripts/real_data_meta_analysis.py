@@ -6,284 +6,88 @@ Using actual extracted data from high-quality studies - NO SIMULATION
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
-from scipy.stats import chi2
+from matplotlib.ticker import FixedLocator, FixedFormatter
+from scipy.special import ndtri, chdtrc, logit, expit
 from datetime import datetime
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+STUDY_DATA_PATH = Path(__file__).resolve().parent.parent / 'data' / 'real_study_data.npz'
+
 class RealDataMetaAnalysis:
     """Perform meta-analysis using real extracted data from literature"""
     
-    def __init__(self):
-        self.studies_data = []
+    def __init__(self, alpha=0.05):
+        self.arr = {}
+        self._biomarkers = np.array([])
+        self._bio_inv = np.array([], dtype=np.intp)
         self.meta_results = {}
+        self.pooled = pd.DataFrame()
+        self.set_confidence_level(alpha)
+    
+    def set_confidence_level(self, alpha):
+        """Cache the two-sided normal quantile used for all confidence intervals"""
+        self.alpha = alpha
+        self.ci_label = f"{(1 - alpha) * 100:g}%"
+        self._z = float(ndtri(1 - alpha / 2))
+        self._z2 = self._z * self._z
         
     def load_real_study_data(self):
         """Load real study data extracted from literature"""
         
-        # Real data from Lin et al. 2020 meta-analysis individual studies
-        fgf21_studies = [
-            {
-                'study': 'Suomalainen2011',
-                'n_patients': 67,
-                'n_controls': 67,
-                'tp': 44,  # 65.7% sensitivity
-                'fp': 0,   # 100% specificity
-                'fn': 23,
-                'tn': 67,
-                'biomarker': 'FGF-21',
-                'cutoff': 350,
-                'population': 'Adult muscle disease'
-            },
-            {
-                'study': 'Davis2013',
-                'n_patients': 76,
-                'n_controls': 83,
-                'tp': 52,  # 68.4% sensitivity
-                'fp': 13,  # 84.3% specificity
-                'fn': 24,
-                'tn': 70,
-                'biomarker': 'FGF-21',
-                'cutoff': 350,
-                'population': 'Mixed pediatric/adult'
-            },
-            {
-                'study': 'Yatsuga2015',
-                'n_patients': 96,
-                'n_controls': 100,
-                'tp': 70,  # 72.9% sensitivity
-                'fp': 15,  # 85% specificity
-                'fn': 26,
-                'tn': 85,
-                'biomarker': 'FGF-21',
-                'cutoff': 200,
-                'population': 'Mixed ages'
-            },
-            {
-                'study': 'Montero2016_FGF21',
-                'n_patients': 51,
-                'n_controls': 51,
-                'tp': 36,  # Estimated 70% sensitivity
-                'fp': 8,   # Estimated 84% specificity
-                'fn': 15,
-                'tn': 43,
-                'biomarker': 'FGF-21',
-                'cutoff': 300,
-                'population': 'Pediatric'
-            },
-            {
-                'study': 'Tsygankova2019_FGF21',
-                'n_patients': 45,
-                'n_controls': 55,
-                'tp': 32,  # Estimated 71% sensitivity
-                'fp': 11,  # Estimated 80% specificity
-                'fn': 13,
-                'tn': 44,
-                'biomarker': 'FGF-21',
-                'cutoff': 250,
-                'population': 'Mixed ages'
-            }
-        ]
-        
-        # Real data for GDF-15 studies
-        gdf15_studies = [
-            {
-                'study': 'Koene2014',
-                'n_patients': 70,
-                'n_controls': 70,
-                'tp': 56,  # 80% sensitivity
-                'fp': 10,  # 85.7% specificity
-                'fn': 14,
-                'tn': 60,
-                'biomarker': 'GDF-15',
-                'cutoff': 1200,
-                'population': 'Adult'
-            },
-            {
-                'study': 'Yatsuga2015',
-                'n_patients': 96,
-                'n_controls': 100,
-                'tp': 71,  # 74% sensitivity
-                'fp': 10,  # 90% specificity
-                'fn': 25,
-                'tn': 90,
-                'biomarker': 'GDF-15',
-                'cutoff': 1800,
-                'population': 'Mixed ages'
-            },
-            {
-                'study': 'Montero2016',
-                'n_patients': 51,
-                'n_controls': 51,
-                'tp': 36,  # 70.6% sensitivity
-                'fp': 7,   # 86.3% specificity
-                'fn': 15,
-                'tn': 44,
-                'biomarker': 'GDF-15',
-                'cutoff': 1200,
-                'population': 'Pediatric'
-            },
-            {
-                'study': 'Ji2019',
-                'n_patients': 42,
-                'n_controls': 48,
-                'tp': 34,  # Estimated 81% sensitivity
-                'fp': 7,   # Estimated 85% specificity
-                'fn': 8,
-                'tn': 41,
-                'biomarker': 'GDF-15',
-                'cutoff': 1500,
-                'population': 'Mixed ages'
-            },
-            {
-                'study': 'Poulsen2019',
-                'n_patients': 38,
-                'n_controls': 42,
-                'tp': 30,  # Estimated 79% sensitivity
-                'fp': 6,   # Estimated 86% specificity
-                'fn': 8,
-                'tn': 36,
-                'biomarker': 'GDF-15',
-                'cutoff': 1400,
-                'population': 'Adult'
-            },
-            {
-                'study': 'Davis2013_GDF15',
-                'n_patients': 76,
-                'n_controls': 83,
-                'tp': 61,  # Estimated 80% sensitivity
-                'fp': 12,  # Estimated 86% specificity
-                'fn': 15,
-                'tn': 71,
-                'biomarker': 'GDF-15',
-                'cutoff': 1300,
-                'population': 'Mixed pediatric/adult'
-            },
-            {
-                'study': 'Tsygankova2019_GDF15',
-                'n_patients': 45,
-                'n_controls': 55,
-                'tp': 38,  # Estimated 84% sensitivity
-                'fp': 8,   # Estimated 85% specificity
-                'fn': 7,
-                'tn': 47,
-                'biomarker': 'GDF-15',
-                'cutoff': 1600,
-                'population': 'Mixed ages'
-            }
-        ]
-        
-        # Real data for Lactate studies (from Shayota 2024 review)
-        lactate_studies = [
-            {
-                'study': 'Haas2008',
-                'n_patients': 113,
-                'n_controls': 45,
-                'tp': 68,  # 60% sensitivity
-                'fp': 8,   # 82% specificity
-                'fn': 45,
-                'tn': 37,
-                'biomarker': 'Lactate',
-                'cutoff': 2.5,
-                'population': 'Mixed ages'
-            },
-            {
-                'study': 'Debray2007',
-                'n_patients': 89,
-                'n_controls': 67,
-                'tp': 62,  # 70% sensitivity
-                'fp': 13,  # 81% specificity
-                'fn': 27,
-                'tn': 54,
-                'biomarker': 'Lactate',
-                'cutoff': 2.2,
-                'population': 'Pediatric'
-            },
-            {
-                'study': 'Naess2009',
-                'n_patients': 156,
-                'n_controls': 89,
-                'tp': 78,  # 50% sensitivity
-                'fp': 18,  # 80% specificity
-                'fn': 78,
-                'tn': 71,
-                'biomarker': 'Lactate',
-                'cutoff': 2.0,
-                'population': 'Mixed ages'
-            },
-            {
-                'study': 'Balasubramaniam2011',
-                'n_patients': 67,
-                'n_controls': 45,
-                'tp': 47,  # 70% sensitivity
-                'fp': 9,   # 80% specificity
-                'fn': 20,
-                'tn': 36,
-                'biomarker': 'Lactate',
-                'cutoff': 2.3,
-                'population': 'Pediatric'
-            }
-        ]
-        
-        # Combine all studies
-        self.studies_data = fgf21_studies + gdf15_studies + lactate_studies
-        
-        print(f"Loaded {len(self.studies_data)} real studies:")
-        print(f"- FGF-21: {len(fgf21_studies)} studies")
-        print(f"- GDF-15: {len(gdf15_studies)} studies") 
-        print(f"- Lactate: {len(lactate_studies)} studies")
-        
-        return self.studies_data
-    
-    def calculate_study_metrics(self, study):
-        """Calculate diagnostic metrics for a single study"""
-        
-        tp, fp, fn, tn = study['tp'], study['fp'], study['fn'], study['tn']
-        
-        # Basic metrics
-        sensitivity = tp / (tp + fn) if (tp + fn) > 0 else 0
-        specificity = tn / (tn + fp) if (tn + fp) > 0 else 0
-        
-        # Confidence intervals for sensitivity and specificity
-        sens_se = np.sqrt(sensitivity * (1 - sensitivity) / (tp + fn)) if (tp + fn) > 0 else 0
-        spec_se = np.sqrt(specificity * (1 - specificity) / (tn + fp)) if (tn + fp) > 0 else 0
+        # Column arrays serialized by build_real_study_data.py; no object arrays, so no pickle
+        with np.load(STUDY_DATA_PATH, allow_pickle=False) as data:
+            self.arr = {k: data[k] for k in data.files}
+        # Per-study metrics are stored alongside the raw columns and sliced per biomarker
+        self.arr.update(self.calculate_study_metrics(self.arr))
+        self._biomarkers, self._bio_inv = np.unique(self.arr['biomarker'], return_inverse=True)
         
-        sens_ci = [
-            max(0, sensitivity - 1.96 * sens_se),
-            min(1, sensitivity + 1.96 * sens_se)
-        ]
+        print(f"Loaded {len(self._bio_inv)} real studies:")
+        for biomarker, count in zip(self._biomarkers, np.bincount(self._bio_inv)):
+            print(f"- {biomarker}: {count} studies")
         
-        spec_ci = [
-            max(0, specificity - 1.96 * spec_se),
-            min(1, specificity + 1.96 * spec_se)
-        ]
-        
-        # Diagnostic odds ratio
-        dor = (tp * tn) / (fp * fn) if fp > 0 and fn > 0 else float('inf')
+        return self.arr
+    
+    def calculate_study_metrics(self, studies):
+        """Calculate diagnostic metrics for a set of studies given as column arrays"""
         
-        # Likelihood ratios
-        lr_pos = sensitivity / (1 - specificity) if specificity < 1 else float('inf')
-        lr_neg = (1 - sensitivity) / specificity if specificity > 0 else float('inf')
+        tp, fp, fn, tn = studies['tp'], studies['fp'], studies['fn'], studies['tn']
+        n_pos = tp + fn
+        n_neg = tn + fp
         
-        # Sample size for weighting
-        n_total = tp + fp + fn + tn
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Basic metrics
+            sensitivity = np.divide(tp, n_pos, out=np.zeros(tp.shape), where=n_pos > 0)
+            specificity = np.divide(tn, n_neg, out=np.zeros(tn.shape), where=n_neg > 0)
+            
+            # Wilson score confidence intervals for sensitivity and specificity
+            sens_ci_lower, sens_ci_upper = self.wilson_interval(sensitivity, n_pos)
+            spec_ci_lower, spec_ci_upper = self.wilson_interval(specificity, n_neg)
+            
+            # Diagnostic odds ratio
+            dor = np.where((fp > 0) & (fn > 0), (tp * tn) / (fp * fn), np.inf)
+            
+            # Likelihood ratios
+            lr_pos = np.where(specificity < 1, sensitivity / (1 - specificity), np.inf)
+            lr_neg = np.where(specificity > 0, (1 - sensitivity) / specificity, np.inf)
         
         return {
-            'study': study['study'],
-            'biomarker': study['biomarker'],
-            'population': study['population'],
-            'n_patients': study['n_patients'],
-            'n_controls': study['n_controls'],
-            'n_total': n_total,
+            'study': studies['study'],
+            'biomarker': studies['biomarker'],
+            'population': studies['population'],
+            'n_patients': studies['n_patients'],
+            'n_controls': studies['n_controls'],
+            'n_total': tp + fp + fn + tn,  # Sample size for weighting
             'sensitivity': sensitivity,
             'specificity': specificity,
-            'sens_ci_lower': sens_ci[0],
-            'sens_ci_upper': sens_ci[1],
-            'spec_ci_lower': spec_ci[0],
-            'spec_ci_upper': spec_ci[1],
+            'sens_ci_lower': sens_ci_lower,
+            'sens_ci_upper': sens_ci_upper,
+            'spec_ci_lower': spec_ci_lower,
+            'spec_ci_upper': spec_ci_upper,
             'dor': dor,
             'lr_positive': lr_pos,
             'lr_negative': lr_neg,
@@ -293,124 +97,223 @@ class RealDataMetaAnalysis:
             'tn': tn
         }
     
-    def perform_meta_analysis_biomarker(self, biomarker_name):
-        """Perform meta-analysis for a specific biomarker"""
-        
-        # Filter studies for this biomarker
-        biomarker_studies = [s for s in self.studies_data if s['biomarker'] == biomarker_name]
-        
-        if len(biomarker_studies) < 2:
-            print(f"Insufficient studies for {biomarker_name} meta-analysis")
-            return None
-        
-        # Calculate metrics for each study
-        study_metrics = [self.calculate_study_metrics(study) for study in biomarker_studies]
-        
-        # Extract data for meta-analysis
-        sensitivities = [m['sensitivity'] for m in study_metrics]
-        specificities = [m['specificity'] for m in study_metrics]
-        weights = [m['n_total'] for m in study_metrics]
+    def wilson_interval(self, p_hat, n):
+        """Wilson score interval for proportions p_hat observed over n trials"""
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            denom = 1 + self._z2 / n
+            center = (p_hat + self._z2 / (2 * n)) / denom
+            half = (self._z / (2 * n)) * np.sqrt(4 * n * p_hat * (1 - p_hat) + self._z2) / denom
+        
+        # The interval always contains p_hat; this also absorbs rounding at 0 and 1.
+        # Studies without any subjects carry no information: [0, 1]
+        lower = np.where(n > 0, np.minimum(center - half, p_hat), 0.0)
+        upper = np.where(n > 0, np.maximum(center + half, p_hat), 1.0)
+        return lower, upper
+    
+    def inverse_variance_terms(self, successes, trials):
+        """Per-study logit proportion y, within-study variance v and fixed-effect terms w, w*y, w*y^2, w^2"""
+        
+        # 0.5 continuity correction, only for studies with p of 0 or 1, keeps logits and variances finite
+        zero_cell = (successes == 0) | (successes == trials)
+        n_adj = np.where(zero_cell, trials + 1, trials)
+        p_adj = np.where(zero_cell, successes + 0.5, successes) / n_adj
+        y = logit(p_adj)
+        v = 1 / (n_adj * p_adj * (1 - p_adj))
+        w = 1 / v
+        wy = w * y
+        
+        return y, v, w, wy, wy * y, w * w
+    
+    def pool_from_sums(self, s0, s1, s2, sw2, k):
+        """Cochran's Q, I^2, H^2 and the DerSimonian-Laird tau^2 from fixed-effect sums (one entry per group)"""
         
-        # Calculate pooled estimates using inverse variance weighting
-        pooled_sensitivity = np.average(sensitivities, weights=weights)
-        pooled_specificity = np.average(specificities, weights=weights)
+        q = np.maximum(0.0, s2 - s1 * s1 / s0)
+        df = k - 1
         
-        # Calculate standard errors
-        sens_var = np.average((np.array(sensitivities) - pooled_sensitivity)**2, weights=weights)
-        spec_var = np.average((np.array(specificities) - pooled_specificity)**2, weights=weights)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            i2 = np.where(q > 0, np.maximum(0.0, (q - df) / q) * 100, 0.0)
+            h2 = q / df
+            tau2 = np.maximum(0.0, np.nan_to_num((q - df) / (s0 - sw2 / s0)))
         
-        sens_se = np.sqrt(sens_var / len(sensitivities))
-        spec_se = np.sqrt(spec_var / len(specificities))
+        return {'q': q, 'i2': i2, 'h2': h2, 'tau2': tau2}
+    
+    def pool_all_biomarkers(self):
+        """Random-effects (DerSimonian-Laird) pooled statistics for every biomarker from two groupby-agg passes"""
         
-        # 95% confidence intervals
-        sens_ci = [
-            max(0, pooled_sensitivity - 1.96 * sens_se),
-            min(1, pooled_sensitivity + 1.96 * sens_se)
-        ]
+        a = self.arr
+        terms = {
+            'sens': self.inverse_variance_terms(a['tp'], a['tp'] + a['fn']),
+            'spec': self.inverse_variance_terms(a['tn'], a['tn'] + a['fp'])
+        }
         
-        spec_ci = [
-            max(0, pooled_specificity - 1.96 * spec_se),
-            min(1, pooled_specificity + 1.96 * spec_se)
-        ]
+        # Log-DOR only for finite, positive study DORs; NaN rows drop out of the mean
+        log_dor = np.full(a['dor'].shape, np.nan)
+        np.log(a['dor'], out=log_dor, where=np.isfinite(a['dor']) & (a['dor'] > 0))
+        
+        flat = pd.DataFrame({
+            'biomarker': a['biomarker'],
+            'n_patients': a['n_patients'],
+            'n_controls': a['n_controls'],
+            'log_dor': log_dor
+        })
+        for prefix, (y, v, w, wy, wy2, w2) in terms.items():
+            flat[f'{prefix}_w'] = w
+            flat[f'{prefix}_wy'] = wy
+            flat[f'{prefix}_wy2'] = wy2
+            flat[f'{prefix}_w2'] = w2
+        sums = flat.groupby('biomarker').agg(
+            n_studies=('sens_w', 'size'),
+            total_patients=('n_patients', 'sum'),
+            total_controls=('n_controls', 'sum'),
+            sens_s0=('sens_w', 'sum'), sens_s1=('sens_wy', 'sum'),
+            sens_s2=('sens_wy2', 'sum'), sens_sw2=('sens_w2', 'sum'),
+            spec_s0=('spec_w', 'sum'), spec_s1=('spec_wy', 'sum'),
+            spec_s2=('spec_wy2', 'sum'), spec_sw2=('spec_w2', 'sum'),
+            log_dor=('log_dor', 'mean')
+        )
+        
+        pooled = sums[['n_studies', 'total_patients', 'total_controls']].copy()
+        k = sums['n_studies'].to_numpy()
+        stats = {}
+        for prefix in terms:
+            stats[prefix] = self.pool_from_sums(sums[f'{prefix}_s0'].to_numpy(),
+                                                sums[f'{prefix}_s1'].to_numpy(),
+                                                sums[f'{prefix}_s2'].to_numpy(),
+                                                sums[f'{prefix}_sw2'].to_numpy(), k)
+        
+        # Second pass: random-effects weights 1/(v + tau^2), with tau^2 broadcast back to each study
+        codes = sums.index.get_indexer(flat['biomarker'])
+        re_terms = pd.DataFrame({'biomarker': flat['biomarker']})
+        for prefix, (y, v, *_) in terms.items():
+            w_star = 1 / (v + stats[prefix]['tau2'][codes])
+            re_terms[f'{prefix}_w'] = w_star
+            re_terms[f'{prefix}_wy'] = w_star * y
+        re_sums = re_terms.groupby('biomarker').sum().loc[sums.index]
+        
+        for measure, prefix in (('sensitivity', 'sens'), ('specificity', 'spec')):
+            mu = re_sums[f'{prefix}_wy'] / re_sums[f'{prefix}_w']
+            se = np.sqrt(1 / re_sums[f'{prefix}_w'])
+            pooled[f'pooled_{measure}'] = expit(mu)
+            pooled[f'{measure}_ci_lower'] = expit(mu - self._z * se)
+            pooled[f'{measure}_ci_upper'] = expit(mu + self._z * se)
+            for stat in ('q', 'i2', 'h2', 'tau2'):
+                pooled[f'{measure}_{stat}'] = stats[prefix][stat]
+        pooled['pooled_dor'] = np.exp(sums['log_dor'])
         
-        # Calculate heterogeneity (I²)
-        sens_q = np.sum(weights * (np.array(sensitivities) - pooled_sensitivity)**2)
-        spec_q = np.sum(weights * (np.array(specificities) - pooled_specificity)**2)
+        # Summary AUC (approximation)
+        pooled['summary_auc'] = (pooled['pooled_sensitivity'] + pooled['pooled_specificity']) / 2
         
-        df = len(sensitivities) - 1
-        sens_i2 = max(0, (sens_q - df) / sens_q * 100) if sens_q > df else 0
-        spec_i2 = max(0, (spec_q - df) / spec_q * 100) if spec_q > df else 0
+        return pooled
+    
+    def perform_meta_analysis_biomarker(self, biomarker_name, mask=None, pooled=None):
+        """Perform meta-analysis for a specific biomarker (optionally with a precomputed study mask and pooled row)"""
         
-        # Calculate pooled diagnostic odds ratio
-        dors = [m['dor'] for m in study_metrics if m['dor'] != float('inf')]
-        log_dors = [np.log(dor) for dor in dors if dor > 0]
+        # Select studies for this biomarker
+        if mask is None:
+            mask = self.arr['biomarker'] == biomarker_name
         
-        if log_dors:
-            pooled_log_dor = np.mean(log_dors)
-            pooled_dor = np.exp(pooled_log_dor)
-        else:
-            pooled_dor = None
+        n_studies = int(mask.sum())
+        if n_studies < 2:
+            print(f"Insufficient studies for {biomarker_name} meta-analysis")
+            return None
         
-        # Summary AUC (approximation)
-        summary_auc = (pooled_sensitivity + pooled_specificity) / 2
-        
-        result = {
-            'biomarker': biomarker_name,
-            'n_studies': len(study_metrics),
-            'total_patients': sum(m['n_patients'] for m in study_metrics),
-            'total_controls': sum(m['n_controls'] for m in study_metrics),
-            'pooled_sensitivity': pooled_sensitivity,
-            'sensitivity_ci_lower': sens_ci[0],
-            'sensitivity_ci_upper': sens_ci[1],
-            'sensitivity_i2': sens_i2,
-            'pooled_specificity': pooled_specificity,
-            'specificity_ci_lower': spec_ci[0],
-            'specificity_ci_upper': spec_ci[1],
-            'specificity_i2': spec_i2,
-            'pooled_dor': pooled_dor,
-            'summary_auc': summary_auc,
-            'individual_studies': study_metrics
-        }
+        if pooled is None:
+            pooled = self.pool_all_biomarkers().loc[biomarker_name]
+        
+        # Metrics for all studies of this biomarker, precomputed at load time
+        study_metrics = {k: v[mask] for k, v in self.arr.items()}
+        
+        # Per-study percentages and (2, n) error-bar offsets for the forest plots
+        sens_pct = study_metrics['sensitivity'] * 100
+        spec_pct = study_metrics['specificity'] * 100
+        sens_err = np.vstack([sens_pct - study_metrics['sens_ci_lower'] * 100,
+                              study_metrics['sens_ci_upper'] * 100 - sens_pct])
+        spec_err = np.vstack([spec_pct - study_metrics['spec_ci_lower'] * 100,
+                              study_metrics['spec_ci_upper'] * 100 - spec_pct])
+        
+        result = {'biomarker': biomarker_name, **pooled.to_dict()}
+        result.update({
+            'n_studies': n_studies,
+            'total_patients': int(pooled['total_patients']),
+            'total_controls': int(pooled['total_controls']),
+            'pooled_dor': float(pooled['pooled_dor']) if np.isfinite(pooled['pooled_dor']) else None,
+            'individual_studies': study_metrics,
+            'sens_pct': sens_pct,
+            'sens_err': sens_err,
+            'spec_pct': spec_pct,
+            'spec_err': spec_err
+        })
         
         return result
     
-    def perform_comprehensive_meta_analysis(self):
-        """Perform meta-analysis for all biomarkers"""
+    def perform_comprehensive_meta_analysis(self, alpha=None):
+        """Perform meta-analysis for all biomarkers (alpha overrides the instance level)"""
         
+        if alpha is not None:
+            self.set_confidence_level(alpha)
         self.load_real_study_data()
         
-        biomarkers = list(set(study['biomarker'] for study in self.studies_data))
-        
-        for biomarker in biomarkers:
-            result = self.perform_meta_analysis_biomarker(biomarker)
+        # Pooled statistics for all biomarkers come from one groupby; the loop only slices study rows
+        pooled = self.pool_all_biomarkers()
+        for k, biomarker in enumerate(self._biomarkers.tolist()):
+            result = self.perform_meta_analysis_biomarker(biomarker, mask=self._bio_inv == k,
+                                                          pooled=pooled.loc[biomarker])
             if result:
                 self.meta_results[biomarker] = result
+        self.pooled = pooled.loc[list(self.meta_results)].copy()
+        
+        self.test_heterogeneity()
         
         return self.meta_results
     
+    def test_heterogeneity(self):
+        """Attach Cochran's Q p-values for all biomarkers with one chi-square call per measure"""
+        
+        if self.pooled.empty:
+            return
+        
+        dfs = self.pooled['n_studies'].to_numpy() - 1
+        for measure in ('sensitivity', 'specificity'):
+            p_values = chdtrc(dfs, self.pooled[f'{measure}_q'].to_numpy())  # chi-square survival function
+            substantial = (p_values < 0.05) & (self.pooled[f'{measure}_i2'].to_numpy() > 50)
+            self.pooled[f'{measure}_q_pvalue'] = p_values
+            self.pooled[f'{measure}_heterogeneity_substantial'] = substantial
+            
+            for r, p_value, flag in zip(self.meta_results.values(), p_values, substantial):
+                r[f'{measure}_q_pvalue'] = float(p_value)
+                r[f'{measure}_heterogeneity_substantial'] = bool(flag)
+    
     def create_forest_plots(self):
         """Create forest plots for meta-analysis results"""
         
         n_biomarkers = len(self.meta_results)
-        fig, axes = plt.subplots(n_biomarkers, 2, figsize=(16, 6 * n_biomarkers))
+        fig, axes = plt.subplots(n_biomarkers, 2, figsize=(16, 6 * n_biomarkers), sharex=True)
         
         if n_biomarkers == 1:
             axes = axes.reshape(1, -1)
         
+        # All panels share the 0-100% axis; keep tick labels visible on every row
+        axes[0, 0].set_xlim(0, 100)
+        for ax in axes.flat:
+            ax.tick_params(labelbottom=True)
+        
         for i, (biomarker, result) in enumerate(self.meta_results.items()):
             studies = result['individual_studies']
+            n_studies = len(studies['study'])
+            labels = np.empty(n_studies + 1, dtype=object)
+            labels[:n_studies] = studies['study']
+            labels[n_studies] = 'Pooled'
+            
+            # Study rows followed by the pooled row, shared by both panels
+            ticks = np.arange(n_studies + 1)
+            y_pos = ticks[:n_studies]
+            pooled_y = n_studies
             
             # Sensitivity forest plot
             ax_sens = axes[i, 0]
-            y_pos = np.arange(len(studies))
-            
-            sensitivities = [s['sensitivity'] * 100 for s in studies]
-            sens_errors = [
-                [s['sensitivity'] * 100 - s['sens_ci_lower'] * 100 for s in studies],
-                [s['sens_ci_upper'] * 100 - s['sensitivity'] * 100 for s in studies]
-            ]
             
-            ax_sens.errorbar(sensitivities, y_pos, xerr=sens_errors, 
+            ax_sens.errorbar(result['sens_pct'], y_pos, xerr=result['sens_err'],
                            fmt='o', capsize=5, capthick=2, markersize=8)
             
             # Add pooled estimate
@@ -420,29 +323,20 @@ class RealDataMetaAnalysis:
                 result['sensitivity_ci_upper'] * 100
             ]
             
-            ax_sens.errorbar([pooled_sens], [len(studies)], 
+            ax_sens.errorbar([pooled_sens], [pooled_y],
                            xerr=[[pooled_sens - pooled_sens_ci[0]], 
                                 [pooled_sens_ci[1] - pooled_sens]],
                            fmt='D', capsize=8, capthick=3, markersize=12, 
                            color='red', label='Pooled')
             
-            ax_sens.set_yticks(list(y_pos) + [len(studies)])
-            ax_sens.set_yticklabels([s['study'] for s in studies] + ['Pooled'])
             ax_sens.set_xlabel('Sensitivity (%)')
             ax_sens.set_title(f'{biomarker}: Sensitivity\n(I² = {result["sensitivity_i2"]:.1f}%)')
-            ax_sens.set_xlim(0, 100)
             ax_sens.grid(True, alpha=0.3)
             
             # Specificity forest plot
             ax_spec = axes[i, 1]
             
-            specificities = [s['specificity'] * 100 for s in studies]
-            spec_errors = [
-                [s['specificity'] * 100 - s['spec_ci_lower'] * 100 for s in studies],
-                [s['spec_ci_upper'] * 100 - s['specificity'] * 100 for s in studies]
-            ]
-            
-            ax_spec.errorbar(specificities, y_pos, xerr=spec_errors,
+            ax_spec.errorbar(result['spec_pct'], y_pos, xerr=result['spec_err'],
                            fmt='s', capsize=5, capthick=2, markersize=8, color='green')
             
             # Add pooled estimate
@@ -452,72 +346,72 @@ class RealDataMetaAnalysis:
                 result['specificity_ci_upper'] * 100
             ]
             
-            ax_spec.errorbar([pooled_spec], [len(studies)],
+            ax_spec.errorbar([pooled_spec], [pooled_y],
                            xerr=[[pooled_spec - pooled_spec_ci[0]],
                                 [pooled_spec_ci[1] - pooled_spec]],
                            fmt='D', capsize=8, capthick=3, markersize=12,
                            color='red', label='Pooled')
             
-            ax_spec.set_yticks(list(y_pos) + [len(studies)])
-            ax_spec.set_yticklabels([s['study'] for s in studies] + ['Pooled'])
             ax_spec.set_xlabel('Specificity (%)')
             ax_spec.set_title(f'{biomarker}: Specificity\n(I² = {result["specificity_i2"]:.1f}%)')
-            ax_spec.set_xlim(0, 100)
             ax_spec.grid(True, alpha=0.3)
+            
+            # Fixed ticks skip the auto-locator pass; one instance per axis since
+            # matplotlib binds locators and formatters to their axis
+            for ax in (ax_sens, ax_spec):
+                ax.yaxis.set_major_locator(FixedLocator(ticks))
+                ax.yaxis.set_major_formatter(FixedFormatter(labels))
         
-        plt.tight_layout()
-        plt.savefig('/home/ubuntu/real_data_forest_plots.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig('/home/ubuntu/real_data_forest_plots.png', format='png', dpi=150)
+        plt.close(fig)
         
         print("Created forest plots with real data")
     
     def create_summary_tables(self):
         """Create summary tables of meta-analysis results"""
         
-        # Meta-analysis summary table
-        summary_data = []
-        for biomarker, result in self.meta_results.items():
-            summary_data.append({
-                'Biomarker': biomarker,
-                'N_Studies': result['n_studies'],
-                'Total_Patients': result['total_patients'],
-                'Total_Controls': result['total_controls'],
-                'Pooled_Sensitivity_%': f"{result['pooled_sensitivity']*100:.1f}",
-                'Sensitivity_95%_CI': f"({result['sensitivity_ci_lower']*100:.1f}-{result['sensitivity_ci_upper']*100:.1f})",
-                'Sensitivity_I²_%': f"{result['sensitivity_i2']:.1f}",
-                'Pooled_Specificity_%': f"{result['pooled_specificity']*100:.1f}",
-                'Specificity_95%_CI': f"({result['specificity_ci_lower']*100:.1f}-{result['specificity_ci_upper']*100:.1f})",
-                'Specificity_I²_%': f"{result['specificity_i2']:.1f}",
-                'Summary_AUC': f"{result['summary_auc']:.3f}",
-                'Pooled_DOR': f"{result['pooled_dor']:.1f}" if result['pooled_dor'] else 'NR'
-            })
-        
-        summary_df = pd.DataFrame(summary_data)
+        # Meta-analysis summary table, one vectorized column per pooled statistic
+        p = self.pooled
+        summary_df = pd.DataFrame({
+            'Biomarker': p.index.to_numpy(),
+            'N_Studies': p['n_studies'].to_numpy(),
+            'Total_Patients': p['total_patients'].to_numpy(),
+            'Total_Controls': p['total_controls'].to_numpy(),
+            'Pooled_Sensitivity_%': self.format_finite(p['pooled_sensitivity'] * 100, '{:.1f}'),
+            f'Sensitivity_{self.ci_label}_CI': self.format_ci(p['sensitivity_ci_lower'], p['sensitivity_ci_upper']),
+            'Sensitivity_I²_%': self.format_finite(p['sensitivity_i2'], '{:.1f}'),
+            'Sensitivity_Q_p': self.format_finite(p['sensitivity_q_pvalue'], '{:.3f}'),
+            'Pooled_Specificity_%': self.format_finite(p['pooled_specificity'] * 100, '{:.1f}'),
+            f'Specificity_{self.ci_label}_CI': self.format_ci(p['specificity_ci_lower'], p['specificity_ci_upper']),
+            'Specificity_I²_%': self.format_finite(p['specificity_i2'], '{:.1f}'),
+            'Specificity_Q_p': self.format_finite(p['specificity_q_pvalue'], '{:.3f}'),
+            'Summary_AUC': self.format_finite(p['summary_auc'], '{:.3f}'),
+            'Pooled_DOR': self.format_finite(p['pooled_dor'], '{:.1f}', missing='NR')
+        })
         summary_df.to_csv('/home/ubuntu/real_data_meta_analysis_summary.csv', index=False)
         
-        # Individual studies table
-        all_studies = []
-        for biomarker, result in self.meta_results.items():
-            for study in result['individual_studies']:
-                all_studies.append({
-                    'Study_ID': study['study'],
-                    'Biomarker': study['biomarker'],
-                    'Population': study['population'],
-                    'N_Patients': study['n_patients'],
-                    'N_Controls': study['n_controls'],
-                    'N_Total': study['n_total'],
-                    'TP': study['tp'],
-                    'FP': study['fp'],
-                    'FN': study['fn'],
-                    'TN': study['tn'],
-                    'Sensitivity_%': f"{study['sensitivity']*100:.1f}",
-                    'Specificity_%': f"{study['specificity']*100:.1f}",
-                    'DOR': f"{study['dor']:.1f}" if study['dor'] != float('inf') else 'Inf',
-                    'LR_Positive': f"{study['lr_positive']:.2f}" if study['lr_positive'] != float('inf') else 'Inf',
-                    'LR_Negative': f"{study['lr_negative']:.2f}" if study['lr_negative'] != float('inf') else 'Inf'
-                })
-        
-        studies_df = pd.DataFrame(all_studies)
+        # Individual studies table, built column-wise from the study arrays
+        analyzed = np.isin(self.arr['biomarker'], list(self.meta_results))
+        metrics = {k: v[analyzed] for k, v in self.arr.items()}
+        
+        studies_df = pd.DataFrame({
+            'Study_ID': metrics['study'],
+            'Biomarker': metrics['biomarker'],
+            'Population': metrics['population'],
+            'N_Patients': metrics['n_patients'],
+            'N_Controls': metrics['n_controls'],
+            'N_Total': metrics['n_total'],
+            'TP': metrics['tp'],
+            'FP': metrics['fp'],
+            'FN': metrics['fn'],
+            'TN': metrics['tn'],
+            'Sensitivity_%': np.round(metrics['sensitivity'] * 100, 1),
+            'Specificity_%': np.round(metrics['specificity'] * 100, 1),
+            'DOR': self.format_finite(metrics['dor'], '{:.1f}'),
+            'LR_Positive': self.format_finite(metrics['lr_positive'], '{:.2f}'),
+            'LR_Negative': self.format_finite(metrics['lr_negative'], '{:.2f}')
+        })
         studies_df.to_csv('/home/ubuntu/real_data_individual_studies.csv', index=False)
         
         print(f"Created summary tables:")
@@ -526,6 +420,17 @@ class RealDataMetaAnalysis:
         
         return summary_df, studies_df
     
+    def format_finite(self, values, fmt, missing='Inf'):
+        """Format finite values with fmt and mark the rest (inf/NaN) with missing"""
+        values = np.asarray(values, dtype=np.float64)
+        return np.where(np.isfinite(values), pd.Series(values).map(fmt.format), missing)
+    
+    def format_ci(self, lower, upper):
+        """Format proportion CI bounds as '(lower-upper)' percentage strings"""
+        lower = pd.Series(self.format_finite(np.asarray(lower) * 100, '{:.1f}'))
+        upper = pd.Series(self.format_finite(np.asarray(upper) * 100, '{:.1f}'))
+        return ('(' + lower + '-' + upper + ')').to_numpy()
+    
     def generate_meta_analysis_report(self):
         """Generate comprehensive meta-analysis report"""
         
@@ -536,8 +441,8 @@ class RealDataMetaAnalysis:
         self.create_forest_plots()
         summary_df, studies_df = self.create_summary_tables()
         
-        # Generate report
-        report = f"""
+        # Generate report from fragments joined once at the end
+        parts = [f"""
 # Real Data Meta-Analysis Results
 ## Mitochondrial Disease Biomarkers
 
@@ -550,22 +455,22 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 ### Meta-Analysis Results Summary
 
-"""
+""", summary_df.to_markdown(index=False, disable_numparse=True), "\n"]
         
         for biomarker, result in self.meta_results.items():
-            report += f"""
+            parts.append(f"""
 #### {biomarker}
 - **Studies**: {result['n_studies']}
 - **Patients**: {result['total_patients']}
 - **Controls**: {result['total_controls']}
-- **Pooled Sensitivity**: {result['pooled_sensitivity']*100:.1f}% (95% CI: {result['sensitivity_ci_lower']*100:.1f}-{result['sensitivity_ci_upper']*100:.1f}%)
-- **Pooled Specificity**: {result['pooled_specificity']*100:.1f}% (95% CI: {result['specificity_ci_lower']*100:.1f}-{result['specificity_ci_upper']*100:.1f}%)
+- **Pooled Sensitivity**: {result['pooled_sensitivity']*100:.1f}% ({self.ci_label} CI: {result['sensitivity_ci_lower']*100:.1f}-{result['sensitivity_ci_upper']*100:.1f}%)
+- **Pooled Specificity**: {result['pooled_specificity']*100:.1f}% ({self.ci_label} CI: {result['specificity_ci_lower']*100:.1f}-{result['specificity_ci_upper']*100:.1f}%)
 - **Summary AUC**: {result['summary_auc']:.3f}
 - **Heterogeneity (I²)**: Sensitivity {result['sensitivity_i2']:.1f}%, Specificity {result['specificity_i2']:.1f}%
 
-"""
+""")
         
-        report += """
+        parts.append("""
 ### Clinical Interpretation
 
 **GDF-15** shows the highest diagnostic accuracy with:
@@ -588,10 +493,10 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 2. **FGF-21**: Requires analytical method standardization
 3. **Combined panels**: May improve diagnostic accuracy
 4. **Age-specific cutoffs**: Needed for pediatric populations
-"""
+""")
         
-        with open('/home/ubuntu/real_data_meta_analysis_report.md', 'w') as f:
-            f.write(report)
+        report = ''.join(parts)
+        Path('/home/ubuntu/real_data_meta_analysis_report.md').write_text(report)
         
         print("Generated comprehensive meta-analysis report with real data")
         return report
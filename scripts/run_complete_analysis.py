@@ -8,9 +8,17 @@ This script runs the complete analysis pipeline from data extraction to final re
 
 import os
 import sys
-import subprocess
+import asyncio
 import logging
+import functools
+import runpy
+import multiprocessing
+import traceback
+import importlib.util
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
 # Setup logging
 logging.basicConfig(
@@ -24,156 +32,324 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Resolved once at import; every pipeline instance shares them
+_SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+_BASE_DIR = os.path.dirname(_SCRIPTS_DIR)
+
+# Distribution names whose importable module name differs
+IMPORT_NAMES = {'scikit-learn': 'sklearn'}
+
+# A pipeline step: script to run plus the names of the tasks whose outputs it needs
+Task = namedtuple('Task', ['name', 'script', 'description', 'deps'])
+
+# Libraries the analysis scripts import; loaded once by the forkserver
+PRELOAD_MODULES = [
+    'numpy', 'pandas', 'matplotlib', 'matplotlib.pyplot',
+    'seaborn', 'scipy.stats', 'scipy.special'
+]
+
+# Script runs fork from a single-threaded server that has already imported the
+# libraries, so they start warm without forking this (multithreaded) interpreter
+_USE_FORKSERVER = 'forkserver' in multiprocessing.get_all_start_methods()
+_FORKSERVER = multiprocessing.get_context('forkserver') if _USE_FORKSERVER else None
+
+# Longest single line of script output forwarded to the log
+_STREAM_LIMIT = 2 ** 20
+
+@functools.lru_cache(maxsize=None)
+def _script_exists(path):
+    """Memoized existence check for pipeline scripts; call cache_clear() to pick up new ones"""
+    return os.path.exists(path)
+
+def _run_script_in_child(script_path, cwd, stdout_conn, stderr_conn):
+    """Forkserver child: send output to the parent's pipes and run the script as __main__"""
+    
+    os.dup2(stdout_conn.fileno(), 1)
+    os.dup2(stderr_conn.fileno(), 2)
+    stdout_conn.close()
+    stderr_conn.close()
+    sys.stdout.reconfigure(line_buffering=True)
+    sys.stderr.reconfigure(line_buffering=True)
+    
+    # Drop the handlers set up when the server imported this module, so script
+    # logging behaves as in a fresh interpreter
+    for handler in logging.root.handlers[:]:
+        logging.root.removeHandler(handler)
+        handler.close()
+    logging.root.setLevel(logging.WARNING)
+    
+    try:
+        os.chdir(cwd)
+        sys.argv = [script_path]
+        sys.path.insert(0, os.path.dirname(script_path))
+        runpy.run_path(script_path, run_name='__main__')
+    except SystemExit:
+        raise
+    except BaseException:
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
 class AnalysisPipeline:
     """Complete analysis pipeline for systematic review"""
     
-    def __init__(self):
+    def __init__(self, verbose=False):
         self.start_time = datetime.now()
-        self.scripts_dir = os.path.dirname(os.path.abspath(__file__))
-        self.base_dir = os.path.dirname(self.scripts_dir)
+        self.verbose = verbose
+        self._deps_ok = None  # cached result of check_dependencies
+        self.scripts_dir = _SCRIPTS_DIR
+        self.base_dir = _BASE_DIR
+        
+        # Edges are the file handoffs between scripts: automated_meta_analysis.py reads
+        # meta_analysis_ready_table.csv from the detailed extraction. The other scripts read
+        # no other script's output (the publication figures and tables use hard-coded
+        # data), so they run as soon as a slot is free. None read stdin or write data to
+        # stdout, so stages cannot be chained through pipes
+        self.tasks = [
+            Task('literature_extraction', 'comprehensive_literature_extraction.py',
+                 'Literature data extraction', []),
+            Task('detailed_extraction', 'extract_detailed_studies.py',
+                 'Detailed study data extraction', []),
+            Task('real_data_meta_analysis', 'real_data_meta_analysis.py',
+                 'Real data meta-analysis', []),
+            Task('automated_meta_analysis', 'automated_meta_analysis.py',
+                 'Automated meta-analysis framework', ['detailed_extraction']),
+            Task('publication_figures', 'create_publication_figures.py',
+                 'Publication-quality figures', []),
+            Task('publication_tables', 'create_publication_tables.py',
+                 'Publication tables', [])
+        ]
         
-    def run_script(self, script_path, description):
-        """Run a Python script and handle errors"""
+    async def _spawn(self, script_path):
+        """Start a Python script in a child process without waiting for it"""
         
-        logger.info(f"Starting: {description}")
-        logger.info(f"Running: {script_path}")
+        # Unbuffered child output so lines reach the log as they are printed
+        return await asyncio.create_subprocess_exec(
+            sys.executable, script_path,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, limit=_STREAM_LIMIT,
+            cwd=self.base_dir, env={**os.environ, 'PYTHONUNBUFFERED': '1'})
+    
+    async def _pipe_to_log(self, stream, log, description):
+        """Forward a child's output stream to the log line by line"""
+        
+        async for line in stream:
+            log("[%s] %s", description, line.decode(errors='replace').rstrip())
+    
+    async def _wait(self, process, description):
+        """Stream a spawned script's output while waiting for it, then log its outcome"""
+        
+        return await self._stream_until_exit(process.stdout, process.stderr, process.wait(), description)
+    
+    async def _stream_until_exit(self, stdout, stderr, exit_code, description):
+        """Forward a child's output streams to the log until it exits, then log its outcome"""
         
         try:
-            result = subprocess.run([
-                sys.executable, script_path
-            ], capture_output=True, text=True, cwd=self.base_dir)
-            
-            if result.returncode == 0:
-                logger.info(f"✓ Completed: {description}")
-                if result.stdout:
-                    logger.info(f"Output: {result.stdout}")
-            else:
-                logger.error(f"✗ Failed: {description}")
-                logger.error(f"Error: {result.stderr}")
-                return False
-                
+            _, _, returncode = await asyncio.gather(
+                self._pipe_to_log(stdout, logger.debug, description),
+                self._pipe_to_log(stderr, logger.error, description),
+                exit_code
+            )
         except Exception as e:
-            logger.error(f"✗ Exception in {description}: {str(e)}")
+            logger.error("✗ Exception in %s: %s", description, e)
             return False
-            
-        return True
+        
+        return self._log_result(description, returncode)
     
-    def check_dependencies(self):
-        """Check if required packages are installed"""
+    async def _pipe_reader(self, fd):
+        """Wrap the read end of an OS pipe in an asyncio stream"""
         
-        logger.info("Checking dependencies...")
+        reader = asyncio.StreamReader(limit=_STREAM_LIMIT)
+        loop = asyncio.get_running_loop()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(fd, 'rb', 0))
+        return reader
+    
+    async def _run_forkserver(self, script_path, description):
+        """Run a script as __main__ in a child of the preloaded forkserver"""
         
-        required_packages = [
-            'pandas', 'numpy', 'matplotlib', 'seaborn', 
-            'scipy', 'scikit-learn', 'openpyxl'
-        ]
+        stdout_r, stdout_w = _FORKSERVER.Pipe(duplex=False)
+        stderr_r, stderr_w = _FORKSERVER.Pipe(duplex=False)
+        process = _FORKSERVER.Process(target=_run_script_in_child,
+                                      args=(script_path, self.base_dir, stdout_w, stderr_w))
+        try:
+            process.start()
+        except Exception as e:
+            for conn in (stdout_r, stderr_r):
+                conn.close()
+            logger.error("✗ Exception in %s: %s", description, e)
+            return False
+        finally:
+            # Only the child writes; closing here lets the readers see EOF
+            stdout_w.close()
+            stderr_w.close()
         
-        missing_packages = []
+        loop = asyncio.get_running_loop()
         
-        for package in required_packages:
+        async def exit_code():
+            # The sentinel becomes readable when the child exits, so no thread blocks in waitpid
+            exited = loop.create_future()
+            loop.add_reader(process.sentinel, lambda: exited.done() or exited.set_result(None))
             try:
-                __import__(package)
-                logger.info(f"✓ {package} is installed")
-            except ImportError:
-                missing_packages.append(package)
-                logger.error(f"✗ {package} is missing")
+                await exited
+            finally:
+                loop.remove_reader(process.sentinel)
+            process.join()
+            returncode = process.exitcode
+            process.close()
+            return returncode
+        
+        # The event loop takes ownership of duplicates; the connections close their own fds
+        readers = []
+        for conn in (stdout_r, stderr_r):
+            readers.append(await self._pipe_reader(os.dup(conn.fileno())))
+            conn.close()
+        
+        return await self._stream_until_exit(*readers, exit_code(), description)
+    
+    def _log_result(self, description, returncode):
+        """Log the outcome of a script run"""
         
-        if missing_packages:
-            logger.error(f"Missing packages: {missing_packages}")
-            logger.error("Please install missing packages: pip install -r requirements.txt")
-            return False
+        if returncode == 0:
+            logger.info("✓ Completed: %s", description)
+            return True
         
-        logger.info("All dependencies satisfied")
-        return True
+        logger.error("✗ Failed: %s (exit code %s)", description, returncode)
+        return False
     
-    def create_output_directories(self):
-        """Create necessary output directories"""
+    async def run_script(self, script_path, description):
+        """Run a Python script and handle errors"""
         
-        directories = [
-            'paper', 'figures', 'data', 'data/raw_data', 
-            'data/processed_data', 'data/meta_analysis_data',
-            'docs', 'results'
-        ]
+        logger.info("Starting: %s", description)
+        logger.info("Running: %s", script_path)
+        
+        # Fork from the preloaded server so the script starts with the libraries already imported
+        if _USE_FORKSERVER:
+            return await self._run_forkserver(script_path, description)
         
-        for directory in directories:
-            dir_path = os.path.join(self.base_dir, directory)
-            os.makedirs(dir_path, exist_ok=True)
-            logger.info(f"Created directory: {directory}")
+        # Fallback for platforms without forkserver (Windows): a fresh interpreter per script
+        try:
+            process = await self._spawn(script_path)
+        except Exception as e:
+            logger.error("✗ Exception in %s: %s", description, e)
+            return False
+        
+        return await self._wait(process, description)
     
-    def run_data_extraction(self):
-        """Run data extraction scripts"""
+    async def run_task_graph(self):
+        """Run each task as soon as all of its dependencies have completed"""
         
-        logger.info("=" * 60)
-        logger.info("PHASE 1: DATA EXTRACTION")
-        logger.info("=" * 60)
+        pending = {task.name: task for task in self.tasks}
+        done = set()
+        running = {}
         
-        scripts = [
-            ("comprehensive_literature_extraction.py", "Literature data extraction"),
-            ("extract_detailed_studies.py", "Detailed study data extraction")
-        ]
+        # At most one CPU-bound script per core
+        slots = asyncio.Semaphore(os.cpu_count() or 1)
+        
+        async def run_when_slot_free(script_path, description):
+            async with slots:
+                return await self.run_script(script_path, description)
         
-        for script, description in scripts:
-            script_path = os.path.join(self.scripts_dir, script)
-            if os.path.exists(script_path):
-                if not self.run_script(script_path, description):
-                    return False
-            else:
-                logger.warning(f"Script not found: {script_path}")
+        while pending or running:
+            ready = [task for task in pending.values() if all(dep in done for dep in task.deps)]
+            
+            for task in ready:
+                del pending[task.name]
+                script_path = os.path.join(self.scripts_dir, task.script)
+                if _script_exists(script_path):
+                    job = asyncio.create_task(run_when_slot_free(script_path, task.description))
+                    running[job] = task
+                else:
+                    logger.warning("Script not found: %s", script_path)
+                    done.add(task.name)
+            
+            if running:
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for job in finished:
+                    task = running.pop(job)
+                    if not job.result():
+                        logger.error("%s failed. Stopping pipeline.", task.description)
+                        # Let scripts already running finish rather than orphaning them
+                        await asyncio.gather(*running)
+                        return False
+                    done.add(task.name)
+            elif not ready:
+                logger.error("Unresolvable task dependencies: %s", sorted(pending))
+                return False
         
         return True
     
-    def run_meta_analysis(self):
-        """Run meta-analysis scripts"""
+    def check_dependencies(self):
+        """Check if required packages are installed (once per pipeline instance)"""
         
-        logger.info("=" * 60)
-        logger.info("PHASE 2: META-ANALYSIS")
-        logger.info("=" * 60)
+        if self._deps_ok is not None:
+            return self._deps_ok
         
-        scripts = [
-            ("real_data_meta_analysis.py", "Real data meta-analysis"),
-            ("automated_meta_analysis.py", "Automated meta-analysis framework")
+        required_packages = [
+            'pandas', 'numpy', 'matplotlib', 'seaborn', 
+            'scipy', 'scikit-learn', 'openpyxl',
+            'tabulate'  # DataFrame.to_markdown in the meta-analysis report
         ]
         
-        for script, description in scripts:
-            script_path = os.path.join(self.scripts_dir, script)
-            if os.path.exists(script_path):
-                if not self.run_script(script_path, description):
-                    return False
-            else:
-                logger.warning(f"Script not found: {script_path}")
+        # Locate packages without executing their (heavy) top-level imports
+        missing_packages = [
+            package for package in required_packages
+            if importlib.util.find_spec(IMPORT_NAMES.get(package, package)) is None
+        ]
         
+        if missing_packages:
+            logger.error("Missing packages: %s (pip install -r requirements.txt)", missing_packages)
+            self._deps_ok = False
+            return False
+        
+        logger.info("Dependencies OK: %d packages", len(required_packages))
+        self._deps_ok = True
         return True
     
-    def run_visualization(self):
-        """Run visualization scripts"""
+    def preload_modules(self):
+        """Have the forkserver import the scripts' heavy libraries once, before any script runs"""
         
-        logger.info("=" * 60)
-        logger.info("PHASE 3: VISUALIZATION")
-        logger.info("=" * 60)
+        if not _USE_FORKSERVER:
+            return
         
-        scripts = [
-            ("create_publication_figures.py", "Publication-quality figures"),
-            ("create_publication_tables.py", "Publication tables")
+        # '__main__' keeps the default preload, so children reuse this module instead of re-importing it
+        _FORKSERVER.set_forkserver_preload(['__main__', *PRELOAD_MODULES])
+        logger.info("Forkserver preloads %d modules for script runs", len(PRELOAD_MODULES))
+    
+    def create_output_directories(self):
+        """Create necessary output directories"""
+        
+        # Leaf directories only; mkdir(parents=True) creates data/ along the way
+        directories = [
+            'paper', 'figures', 'data/raw_data',
+            'data/processed_data', 'data/meta_analysis_data',
+            'docs', 'results'
         ]
         
-        for script, description in scripts:
-            script_path = os.path.join(self.scripts_dir, script)
-            if os.path.exists(script_path):
-                if not self.run_script(script_path, description):
-                    return False
-            else:
-                logger.warning(f"Script not found: {script_path}")
+        created = [directory for directory in directories
+                   if not Path(self.base_dir, directory).is_dir()]
         
-        return True
+        # mkdir blocks on the filesystem, so on network storage the round-trips overlap
+        if created:
+            with ThreadPoolExecutor(max_workers=len(created)) as executor:
+                list(executor.map(
+                    lambda directory: Path(self.base_dir, directory).mkdir(parents=True, exist_ok=True),
+                    created))
+            if self.verbose:
+                for directory in created:
+                    logger.info("Created directory: %s", directory)
+        
+        logger.info("Ensured %d output directories (%d created)", len(directories), len(created))
     
-    def generate_summary_report(self):
-        """Generate final summary report"""
+    def generate_summary_report(self, end_time=None):
+        """Generate final summary report; returns (end_time, duration) for the caller to reuse"""
         
         logger.info("=" * 60)
         logger.info("GENERATING SUMMARY REPORT")
         logger.info("=" * 60)
         
-        end_time = datetime.now()
+        if end_time is None:
+            end_time = datetime.now()
         duration = end_time - self.start_time
         
         report = f"""
@@ -213,52 +389,59 @@ class AnalysisPipeline:
 """
         
         report_path = os.path.join(self.base_dir, 'ANALYSIS_SUMMARY.md')
-        with open(report_path, 'w') as f:
-            f.write(report)
+        report_bytes = report.encode('utf-8')
+        
+        # Leave an identical report untouched so its mtime stays valid for incremental builds.
+        # The run timestamps are part of the content, so the file always matches this run
+        if os.path.isfile(report_path):
+            with open(report_path, 'rb') as f:
+                unchanged = f.read() == report_bytes
+        else:
+            unchanged = False
         
-        logger.info("Summary report generated: ANALYSIS_SUMMARY.md")
+        if unchanged:
+            logger.info("Summary unchanged: ANALYSIS_SUMMARY.md")
+        else:
+            with open(report_path, 'wb') as f:
+                f.write(report_bytes)
+            logger.info("Summary report generated: ANALYSIS_SUMMARY.md")
         logger.info(report)
+        
+        return end_time, duration
     
-    def run_complete_pipeline(self):
+    async def run_complete_pipeline(self):
         """Run the complete analysis pipeline"""
         
         logger.info("=" * 80)
         logger.info("MITOCHONDRIAL DISEASE BIOMARKERS SYSTEMATIC REVIEW")
         logger.info("COMPLETE ANALYSIS PIPELINE")
         logger.info("=" * 80)
-        logger.info(f"Start time: {self.start_time}")
+        logger.info("Start time: %s", self.start_time)
         
         # Check dependencies
         if not self.check_dependencies():
             logger.error("Dependency check failed. Exiting.")
             return False
         
+        self.preload_modules()
+        
         # Create directories
         self.create_output_directories()
         
-        # Run analysis phases
-        phases = [
-            (self.run_data_extraction, "Data Extraction"),
-            (self.run_meta_analysis, "Meta-Analysis"),
-            (self.run_visualization, "Visualization")
-        ]
+        # Run analysis tasks
+        logger.info("=" * 60)
+        logger.info("RUNNING ANALYSIS TASKS")
+        logger.info("=" * 60)
         
-        for phase_func, phase_name in phases:
-            logger.info(f"\nStarting {phase_name} phase...")
-            if not phase_func():
-                logger.error(f"{phase_name} phase failed. Stopping pipeline.")
-                return False
-            logger.info(f"{phase_name} phase completed successfully.")
+        if not await self.run_task_graph():
+            return False
         
         # Generate summary
-        self.generate_summary_report()
-        
-        end_time = datetime.now()
-        duration = end_time - self.start_time
+        _, duration = self.generate_summary_report(end_time=datetime.now())
         
         logger.info("=" * 80)
         logger.info("PIPELINE COMPLETED SUCCESSFULLY!")
-        logger.info(f"Total duration: {duration}")
+        logger.info("Total duration: %s", duration)
         logger.info("=" * 80)
         
         return True
@@ -266,10 +449,14 @@ class AnalysisPipeline:
 def main():
     """Main function to run the complete analysis"""
     
-    pipeline = AnalysisPipeline()
+    pipeline = AnalysisPipeline(verbose='--verbose' in sys.argv[1:])
+    
+    # Script output is logged at DEBUG; show it only when asked for
+    if pipeline.verbose:
+        logger.setLevel(logging.DEBUG)
     
     try:
-        success = pipeline.run_complete_pipeline()
+        success = asyncio.run(pipeline.run_complete_pipeline())
         
         if success:
             print("\n🎉 Analysis pipeline completed successfully!")
@@ -285,7 +472,7 @@ def main():
         logger.info("Analysis interrupted by user")
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
+        logger.error("Unexpected error: %s", e)
         sys.exit(1)
 
 if __name__ == "__main__":